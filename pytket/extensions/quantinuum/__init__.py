@@ -22,6 +22,7 @@ from .backends import (
     QuantinuumAPI,
     QuantinuumAPIOffline,
     QuantinuumBackendCompilationConfig,
+    JobSubmissionError,
     Language,
     prune_shots_detected_as_leaky,
     have_pecos,
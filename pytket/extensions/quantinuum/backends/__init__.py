@@ -18,6 +18,7 @@
 from .quantinuum import (
     QuantinuumBackend,
     QuantinuumBackendCompilationConfig,
+    JobSubmissionError,
     Language,
     have_pecos,
 )
@@ -17,26 +17,65 @@ Functions used to submit jobs with Quantinuum API.
 """
 
 import time
+import random
 from http import HTTPStatus
-from typing import Optional, Dict, Tuple
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Optional,
+    Dict,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import json
 import getpass
+import threading
+import jwt
 from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import (
+    ConnectionError as RequestsConnectionError,
+    ReadTimeout,
+    RequestException,
+)
 from requests.models import Response
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util import Retry
 from websockets import connect, exceptions
-import nest_asyncio  # type: ignore
+
+_json_loads: Callable[[Union[bytes, bytearray, str]], Any]
+try:
+    # orjson decodes the (possibly large) responses noticeably faster
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 from .config import QuantinuumConfig
 from .credential_storage import CredentialStorage, MemoryCredentialStorage
 from .federated_login import microsoft_login
 
-# This is necessary for use in Jupyter notebooks to allow for nested asyncio loops
-try:
-    nest_asyncio.apply()
-except (RuntimeError, ValueError):
-    # May fail in some cloud environments: ignore.
-    pass
+T = TypeVar("T")
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # no event loop running in thread, call asyncio.run to use a new loop
+        return asyncio.run(coro)
+    # An event loop is already running in this thread (e.g. in a Jupyter
+    # notebook) and cannot be re-entered: run a new loop in another thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 
 class QuantinuumAPIError(Exception):
@@ -49,22 +88,98 @@ class _OverrideManager:
         api_handler: "QuantinuumAPI",
         timeout: Optional[int] = None,
         retry_timeout: Optional[int] = None,
+        retry_timeout_min: Optional[float] = None,
+        retry_timeout_max: Optional[float] = None,
     ):
         self._timeout = timeout
         self._retry = retry_timeout
+        # A fixed retry_timeout pins both polling bounds unless they are given
+        self._retry_min = (
+            retry_timeout_min if retry_timeout_min is not None else retry_timeout
+        )
+        self._retry_max = (
+            retry_timeout_max if retry_timeout_max is not None else retry_timeout
+        )
         self.api_handler = api_handler
         self._orig_timeout = api_handler.timeout
         self._orig_retry = api_handler.retry_timeout
+        self._orig_retry_min = api_handler.retry_timeout_min
+        self._orig_retry_max = api_handler.retry_timeout_max
 
     def __enter__(self) -> None:
         if self._timeout is not None:
             self.api_handler.timeout = self._timeout
         if self._retry is not None:
             self.api_handler.retry_timeout = self._retry
+        if self._retry_min is not None:
+            self.api_handler.retry_timeout_min = self._retry_min
+        if self._retry_max is not None:
+            self.api_handler.retry_timeout_max = self._retry_max
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:  # type: ignore
         self.api_handler.timeout = self._orig_timeout
         self.api_handler.retry_timeout = self._orig_retry
+        self.api_handler.retry_timeout_min = self._orig_retry_min
+        self.api_handler.retry_timeout_max = self._orig_retry_max
+
+
+class _PollSchedule:
+    """Backoff and long polling policy shared by the job status polling loops.
+
+    Polling backs off exponentially while a job stays in the same state and
+    polls quickly again as soon as it moves on. With long polling, the server
+    holds each request instead; if it keeps answering early without a state
+    change, the schedule falls back to plain polling.
+    """
+
+    def __init__(self, api_handler: "QuantinuumAPI", deadline: float):
+        self.deadline = deadline
+        self._min_delay = api_handler.retry_timeout_min
+        self._max_delay = api_handler.retry_timeout_max
+        self._max_early_answers = api_handler.LONG_POLL_MAX_EARLY_ANSWERS
+        self._delay = self._min_delay
+        self._long_poll = api_handler.use_long_polling
+        self._early_answers = 0
+        self._wait_seconds = 0
+        self._status: Optional[str] = None
+
+    def wait_seconds(self) -> Optional[int]:
+        """Seconds the server should hold the next status request, or `None`
+        when not long polling."""
+        if not self._long_poll:
+            return None
+        wait_seconds = max(1, int(self._max_delay))
+        if self.deadline != float("inf"):
+            remaining = self.deadline - time.time()
+            wait_seconds = max(1, min(wait_seconds, int(remaining)))
+        self._wait_seconds = wait_seconds
+        return wait_seconds
+
+    def next_delay(self, status: Optional[str], request_time: float) -> Optional[float]:
+        """Seconds to sleep before the next status request, or `None` to send
+        it at once.
+
+        :param status: Status returned by the last request.
+        :param request_time: Time at which the last request was sent.
+        """
+        if status != self._status:
+            self._status = status
+            self._delay = self._min_delay
+            self._early_answers = 0
+            if self._long_poll:
+                return None
+        elif self._long_poll:
+            # allow for servers that cap or cut short the hold
+            if time.time() - request_time >= self._wait_seconds / 2:
+                self._early_answers = 0
+                return None
+            self._early_answers += 1
+            if self._early_answers >= self._max_early_answers:
+                self._long_poll = False
+        delay = self._delay + random.uniform(0, self._delay * 0.1)
+        self._delay = min(self._delay * 2, self._max_delay)
+        # don't sleep past the deadline
+        return min(delay, max(0.0, self.deadline - time.time()))
 
 
 class QuantinuumAPI:
@@ -72,12 +187,40 @@ class QuantinuumAPI:
     Interface to the Quantinuum online remote API.
     """
 
-    JOB_DONE = ["failed", "completed", "canceled"]
+    JOB_DONE = frozenset({"failed", "completed", "canceled"})
 
     DEFAULT_API_URL = "https://qapi.quantinuum.com/"
 
     AZURE_PROVIDER = "microsoft"
 
+    # connection pool sizing and retries of the default HTTP session; read
+    # timeouts are not retried, as they bound long polls and event streams
+    HTTP_POOL_CONNECTIONS = 16
+    HTTP_POOL_MAXSIZE = 64
+    HTTP_MAX_RETRIES = Retry(
+        total=3,
+        read=False,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    )
+
+    # maximum number of jobs submitted concurrently by _submit_jobs
+    MAX_SUBMISSION_WORKERS = 16
+
+    # size of the chunks in which job status responses are downloaded
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+    # consecutive long polls answered early, without a change of state, after
+    # which the server is assumed not to support long polling
+    LONG_POLL_MAX_EARLY_ANSWERS = 3
+
+    # seconds without data after which a server-sent events stream is reopened
+    SSE_READ_TIMEOUT = 30
+
+    # seconds before its expiry at which a cached id-token is no longer used
+    ID_TOKEN_EXPIRY_MARGIN = 60
+
     # Quantinuum API error codes
     # mfa verification code is required during login
     ERROR_CODE_MFA_REQUIRED = 73
@@ -91,6 +234,9 @@ class QuantinuumAPI:
         provider: Optional[str] = None,
         support_mfa: bool = True,
         session: Optional[Session] = None,
+        use_long_polling: bool = False,
+        max_concurrent_requests: int = 32,
+        use_sse: bool = False,
         __user_name: Optional[str] = None,
         __pwd: Optional[str] = None,
     ):
@@ -105,18 +251,58 @@ class QuantinuumAPI:
         :param support_mfa: Whether to wait for the user to input the auth code,
             defaults to True
         :param session: Session for HTTP requests, defaults to None
-            A new requests.Session will be initialised if None
-            is provided
+            A new requests.Session, keeping a pool of persistent
+            connections and retrying idempotent requests on gateway
+            errors, will be initialised if None is provided
+        :param use_long_polling: Whether to ask the server to hold job status
+            requests open until the job changes state when polling, defaults
+            to False. Falls back to regular polling if the server answers
+            straight away.
+        :param max_concurrent_requests: Maximum number of job status requests
+            in flight at once, defaults to 32. Further calls, e.g. from
+            threads fanning out :py:meth:`retrieve_job`, block until a request
+            completes instead of contending for pooled connections. Also the
+            number of threads running requests for the asynchronous methods.
+        :param use_sse: Whether to wait for job completion on the server-sent
+            events stream of the job, defaults to False. Falls back to
+            websocket or polling if the server does not offer the stream.
+            Each open stream holds a thread of its own, outside the request
+            threads bounded by ``max_concurrent_requests``.
         """
         self.online = True
 
         self.url = f"{api_url if api_url else self.DEFAULT_API_URL}v{api_version}/"
+        self._job_url = f"{self.url}job"
+        self._login_url = f"{self.url}login"
+        self._ws_uri = self.url.replace("https://", "wss://ws.")
 
         if session is None:
             self.session = Session()
+            self.session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=self.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=self.HTTP_POOL_MAXSIZE,
+                    max_retries=self.HTTP_MAX_RETRIES,
+                ),
+            )
         else:
             self.session = session
 
+        # expiry time of the cached id-token and the request headers authorizing
+        # with it, kept together so that threads read them consistently
+        self._id_token_cache: Optional[Tuple[float, Dict[str, str]]] = None
+        # only one thread at a time may refresh tokens or ask for credentials
+        self._login_lock = threading.Lock()
+        # caps the job status requests in flight so they queue here rather
+        # than on the connection pool of the session
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        # threads running the blocking requests of the asynchronous methods, so
+        # that they neither queue on nor starve the default executor of the loop
+        self._request_executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_requests, thread_name_prefix="QuantinuumAPI"
+        )
+
         self._cred_store: CredentialStorage
         if token_store is None:
             self._cred_store = MemoryCredentialStorage()
@@ -141,59 +327,68 @@ class QuantinuumAPI:
 
         self.api_version = api_version
         self.use_websocket = use_websocket
+        self.use_long_polling = use_long_polling
+        self.use_sse = use_sse
         self.provider = provider
         self.support_mfa = support_mfa
 
-        self.ws_timeout = 180
+        # keepalive and closing handshake of the websocket connection, handled by
+        # the websockets library
+        self.ws_ping_interval = 30
+        self.ws_ping_timeout = 10
+        self.ws_close_timeout = 5
         self.retry_timeout = 5
+        # bounds of the exponential backoff between polls of the job status
+        self.retry_timeout_min: float = 1
+        self.retry_timeout_max: float = 30
         self.timeout: Optional[int] = None  # don't timeout by default
 
     def override_timeouts(
-        self, timeout: Optional[int] = None, retry_timeout: Optional[int] = None
+        self,
+        timeout: Optional[int] = None,
+        retry_timeout: Optional[int] = None,
+        retry_timeout_min: Optional[float] = None,
+        retry_timeout_max: Optional[float] = None,
     ) -> _OverrideManager:
-        return _OverrideManager(self, timeout=timeout, retry_timeout=retry_timeout)
+        return _OverrideManager(
+            self,
+            timeout=timeout,
+            retry_timeout=retry_timeout,
+            retry_timeout_min=retry_timeout_min,
+            retry_timeout_max=retry_timeout_max,
+        )
 
     def _request_tokens(self, user: str, pwd: str) -> None:
         """Method to send login request to machine api and save tokens."""
+        self._invalidate_id_token()
         body = {"email": user, "password": pwd}
-        try:
-            # send request to login
-            response = self.session.post(
-                f"{self.url}login",
-                json.dumps(body),
-            )
-
-            # handle mfa verification
-            if response.status_code == HTTPStatus.UNAUTHORIZED:
-                error_code = response.json()["error"]["code"]
-                if error_code == self.ERROR_CODE_MFA_REQUIRED:
-                    if not self.support_mfa:
-                        raise QuantinuumAPIError(
-                            "This API instance does not support MFA login."
-                        )
-                    # get a mfa code from user input
-                    mfa_code = input("Enter your MFA verification code: ")
-                    body["code"] = mfa_code
-
-                    # resend request to login
-                    response = self.session.post(
-                        f"{self.url}login",
-                        json.dumps(body),
+        # send request to login
+        response = self.session.post(self._login_url, json=body)
+
+        # handle mfa verification
+        message = None
+        if response.status_code == HTTPStatus.UNAUTHORIZED:
+            message = _json_loads(response.content)
+            error_code = message["error"]["code"]
+            if error_code == self.ERROR_CODE_MFA_REQUIRED:
+                if not self.support_mfa:
+                    raise QuantinuumAPIError(
+                        "This API instance does not support MFA login."
                     )
+                # get a mfa code from user input
+                body["code"] = input("Enter your MFA verification code: ")
 
-            self._response_check(response, "Login")
-            resp_dict = response.json()
-            self._cred_store.save_tokens(
-                resp_dict["id-token"], resp_dict["refresh-token"]
-            )
+                # resend request to login
+                response = self.session.post(self._login_url, json=body)
+                message = None
 
-        finally:
-            del user
-            del pwd
-            del body
+        self._response_check(response, "Login", parsed=message)
+        resp_dict = _json_loads(response.content)
+        self._cred_store.save_tokens(resp_dict["id-token"], resp_dict["refresh-token"])
 
     def _request_tokens_federated(self) -> None:
         """Method to perform federated login and save tokens."""
+        self._invalidate_id_token()
 
         if self.provider is not None and self.provider.lower() == self.AZURE_PROVIDER:
             _, token = microsoft_login()
@@ -202,50 +397,32 @@ class QuantinuumAPI:
                 f"Unsupported provider for login", HTTPStatus.UNAUTHORIZED
             )
 
-        body = {"provider-token": token}
-
-        try:
-            response = self.session.post(
-                f"{self.url}login",
-                json.dumps(body),
-            )
-            self._response_check(response, "Login")
-            resp_dict = response.json()
-            self._cred_store.save_tokens(
-                resp_dict["id-token"], resp_dict["refresh-token"]
-            )
-        finally:
-            del body
+        response = self.session.post(self._login_url, json={"provider-token": token})
+        self._response_check(response, "Login")
+        resp_dict = _json_loads(response.content)
+        self._cred_store.save_tokens(resp_dict["id-token"], resp_dict["refresh-token"])
 
     def _refresh_id_token(self, refresh_token: str) -> None:
         """Method to refresh ID token using a refresh token."""
-        body = {"refresh-token": refresh_token}
-        try:
-            # send request to login
-            response = self.session.post(
-                f"{self.url}login",
-                json.dumps(body),
-            )
-
-            message = response.json()
+        self._invalidate_id_token()
+        # send request to login
+        response = self.session.post(
+            self._login_url, json={"refresh-token": refresh_token}
+        )
 
-            if (
-                response.status_code == HTTPStatus.BAD_REQUEST
-                and message is not None
-                and "Invalid Refresh Token" in message["error"]["text"]
-            ):
-                # ask user for credentials to login again
-                self.full_login()
+        message = _json_loads(response.content)
 
-            else:
-                self._response_check(response, "Token Refresh")
-                self._cred_store.save_tokens(
-                    message["id-token"], message["refresh-token"]
-                )
+        if (
+            response.status_code == HTTPStatus.BAD_REQUEST
+            and message is not None
+            and "Invalid Refresh Token" in message["error"]["text"]
+        ):
+            # ask user for credentials to login again
+            self.full_login()
 
-        finally:
-            del refresh_token
-            del body
+        else:
+            self._response_check(response, "Token Refresh", parsed=message)
+            self._cred_store.save_tokens(message["id-token"], message["refresh-token"])
 
     def _get_credentials(self) -> Tuple[str, str]:
         """Method to ask for user's credentials"""
@@ -276,83 +453,195 @@ class QuantinuumAPI:
 
         :return: (str) login token
         """
-        # check if refresh_token exists
-        refresh_token = self._cred_store.refresh_token
-        if refresh_token is None:
-            self.full_login()
+        return self._authorize()["Authorization"]
+
+    def _authorize(self) -> Dict[str, str]:
+        """Log in as :py:meth:`login` does.
+
+        :return: request headers authorizing with the id-token, to be used as
+            they are rather than read back from the instance, which other
+            threads may log out or in again meanwhile
+        """
+        # reuse the cached id-token while it is known to be valid
+        cached = self._id_token_cache
+        if cached is not None and time.time() < cached[0]:
+            return cached[1]
+
+        with self._login_lock:
+            # another thread may have logged in while we waited for the lock
+            cached = self._id_token_cache
+            if cached is not None and time.time() < cached[0]:
+                return cached[1]
+
+            # check if refresh_token exists
             refresh_token = self._cred_store.refresh_token
+            if refresh_token is None:
+                self.full_login()
+                refresh_token = self._cred_store.refresh_token
 
-        if refresh_token is None:
-            raise QuantinuumAPIError(
-                "Unable to retrieve refresh token or authenticate."
-            )
+            if refresh_token is None:
+                raise QuantinuumAPIError(
+                    "Unable to retrieve refresh token or authenticate."
+                )
 
-        # check if id_token exists
-        id_token = self._cred_store.id_token
-        if id_token is None:
-            self._refresh_id_token(refresh_token)
+            # check if id_token exists
             id_token = self._cred_store.id_token
+            if id_token is None:
+                self._refresh_id_token(refresh_token)
+                id_token = self._cred_store.id_token
+
+            if id_token is None:
+                raise QuantinuumAPIError(
+                    "Unable to retrieve id token or refresh or login."
+                )
+
+            return self._cache_id_token(id_token)
+
+    def _cache_id_token(self, id_token: str) -> Dict[str, str]:
+        """Cache the id-token together with the time at which it stops being used,
+        taken from its expiry claim and capped by the token store's lifetime.
 
-        if id_token is None:
-            raise QuantinuumAPIError("Unable to retrieve id token or refresh or login.")
+        :return: request headers authorizing with the id-token
+        """
+        exp = jwt.decode(
+            id_token,
+            algorithms=["HS256"],
+            options={"verify_signature": False},
+        )["exp"]
+        headers = {"Authorization": id_token}
+        self._id_token_cache = (
+            min(
+                exp - self.ID_TOKEN_EXPIRY_MARGIN,
+                time.time() + self._cred_store._id_timedelt.total_seconds(),
+            ),
+            headers,
+        )
+        return headers
 
-        return id_token
+    def _invalidate_id_token(self) -> None:
+        self._id_token_cache = None
 
     def delete_authentication(self) -> None:
         """Remove stored credentials and tokens"""
+        self._invalidate_id_token()
         self._cred_store.delete_credential()
 
     def _submit_job(self, body: Dict) -> Response:
-        id_token = self.login()
+        headers = self._authorize()
         # send job request
-        return self.session.post(
-            f"{self.url}job",
-            json.dumps(body),
-            headers={"Authorization": id_token},
-        )
+        return self.session.post(self._job_url, json=body, headers=headers)
+
+    def _submit_jobs(
+        self, bodies: List[Dict], ordered: bool = False
+    ) -> List[Union[Response, Exception]]:
+        """Submit several jobs, concurrently unless their order matters.
+
+        A failed submission does not stop the concurrent ones, so that the
+        responses to all the jobs the server accepted are returned.
+
+        :param bodies: request bodies of the jobs
+        :param ordered: submit the jobs one after the other, stopping at the
+            first one that is not accepted
+        :return: the response to each submission, or the exception raised by
+            it, in the order of ``bodies``; shorter than ``bodies`` if an
+            ordered submission stopped early
+        """
+        results: List[Union[Response, Exception]] = []
+        if ordered or len(bodies) <= 1:
+            for body in bodies:
+                try:
+                    res = self._submit_job(body)
+                except Exception as e:
+                    results.append(e)
+                    break
+                results.append(res)
+                if res.status_code != HTTPStatus.OK:
+                    break
+            return results
+        # log in once so that the submissions share the same id-token
+        self.login()
+        with ThreadPoolExecutor(
+            max_workers=min(len(bodies), self.MAX_SUBMISSION_WORKERS)
+        ) as executor:
+            futures = [executor.submit(self._submit_job, body) for body in bodies]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _response_check(
+        self, res: Response, description: str, parsed: Optional[Dict] = None
+    ) -> None:
+        """Consolidate as much error-checking of response
 
-    def _response_check(self, res: Response, description: str) -> None:
-        """Consolidate as much error-checking of response"""
+        :param res: response to check
+        :param description: description of the request, used in error messages
+        :param parsed: decoded body of the response, if the caller already has it
+        """
+        if res.status_code == HTTPStatus.OK:
+            return
+        # the body is only needed for the error message
+        jr = _json_loads(res.content) if parsed is None else parsed
         # check if token has expired or is generally unauthorized
         if res.status_code == HTTPStatus.UNAUTHORIZED:
-            jr = res.json()
             raise QuantinuumAPIError(
                 (
                     f"Authorization failure attempting: {description}."
                     f"\n\nServer Response: {jr}"
                 )
             )
-        elif res.status_code != HTTPStatus.OK:
-            jr = res.json()
-            raise QuantinuumAPIError(
-                f"HTTP error attempting: {description}.\n\nServer Response: {jr}"
-            )
+        raise QuantinuumAPIError(
+            f"HTTP error attempting: {description}.\n\nServer Response: {jr}"
+        )
 
     def retrieve_job_status(
-        self, job_id: str, use_websocket: Optional[bool] = None
+        self,
+        job_id: str,
+        use_websocket: Optional[bool] = None,
+        wait_seconds: Optional[int] = None,
     ) -> Optional[Dict]:
         """
         Retrieves job status from device.
 
         :param job_id: unique id of job
         :param use_websocket: use websocket to minimize interaction
+        :param wait_seconds: ask the server to hold the request for up to this
+            many seconds until the job changes state (long polling)
 
         :return: (dict) output from API
 
         """
-        job_url = f"{self.url}job/{job_id}"
+        job_url = f"{self._job_url}/{job_id}"
         # Using the login wrapper we will automatically try to refresh token
-        id_token = self.login()
+        headers = self._authorize()
+        query = []
         if use_websocket or (use_websocket is None and self.use_websocket):
-            job_url += "?websocket=true"
-        res = self.session.get(job_url, headers={"Authorization": id_token})
-
-        jr: Optional[Dict] = None
-        # Check for invalid responses, and raise an exception if so
-        self._response_check(res, "job status")
-        # if we successfully got status return the decoded details
-        if res.status_code == HTTPStatus.OK:
-            jr = res.json()
+            query.append("websocket=true")
+        request_timeout = None
+        if wait_seconds is not None:
+            query.append(f"wait={wait_seconds}")
+            # leave the server time to answer before giving up on the request
+            request_timeout = wait_seconds + 5
+        if query:
+            job_url += "?" + "&".join(query)
+        # hold a slot until the body is consumed and the connection released
+        with self._request_slots:
+            # stream the body, which holds the results and can be large
+            res = self.session.get(
+                job_url,
+                headers=headers,
+                timeout=request_timeout,
+                stream=True,
+            )
+            # Check for invalid responses, and raise an exception if so
+            self._response_check(res, "job status")
+            # we successfully got status, return the decoded details
+            body = bytearray()
+            for chunk in res.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                body += chunk
+        jr: Dict = _json_loads(body)
         return jr
 
     def retrieve_job(
@@ -370,91 +659,292 @@ class QuantinuumAPI:
         jr = self.retrieve_job_status(job_id, use_websocket)
         if not jr:
             raise QuantinuumAPIError(f"Unable to retrive job {job_id}")
-        if "status" in jr and jr["status"] in self.JOB_DONE:
+        if jr.get("status") in self.JOB_DONE:
             return jr
 
+        # any fallback from one way of waiting to another keeps the same deadline
+        deadline = self._deadline()
+        if self.use_sse:
+            sse_jr = self._stream_results(job_id, jr, deadline)
+            if sse_jr is not None:
+                return sse_jr
+
         if "websocket" in jr:
             # wait for job completion using websocket
-            try:
-                loop = asyncio.get_event_loop()
-                jr = loop.run_until_complete(self._wait_results(job_id))
-            except RuntimeError:
-                # no event loop in thread, call asyncio.run to use a new loop
-                jr = asyncio.run(self._wait_results(job_id))
+            jr = _run_coroutine(self._wait_results(job_id, deadline))
 
         else:
             # poll for job completion
-            jr = self._poll_results(job_id)
+            jr = self._poll_results(job_id, deadline)
         return jr
 
-    def _poll_results(self, job_id: str) -> Optional[Dict]:
+    async def retrieve_job_async(
+        self, job_id: str, use_websocket: Optional[bool] = None
+    ) -> Optional[Dict]:
+        """
+        Retrieves job from device, without blocking the running event loop.
+        Use this rather than :py:meth:`retrieve_job` from asynchronous code,
+        e.g. ``await api.retrieve_job_async(job_id)`` in a Jupyter notebook.
+
+        :param job_id: unique id of job
+        :param use_websocket: use websocket to minimize interaction
+
+        :return: (dict) output from API
+
+        """
+        jr = await self._in_thread(self.retrieve_job_status, job_id, use_websocket)
+        if not jr:
+            raise QuantinuumAPIError(f"Unable to retrive job {job_id}")
+        if jr.get("status") in self.JOB_DONE:
+            return jr
+
+        deadline = self._deadline()
+        if self.use_sse:
+            # the stream is held for the lifetime of the job, so it gets its own
+            # thread rather than one of the request threads
+            sse_jr = await self._in_own_thread(
+                self._stream_results, job_id, jr, deadline
+            )
+            if sse_jr is not None:
+                return sse_jr
+
+        if "websocket" in jr:
+            # wait for job completion using websocket
+            return await self._wait_results(job_id, deadline)
+        # poll for job completion
+        return await self._poll_results_async(job_id, deadline)
+
+    def retrieve_jobs(
+        self, job_ids: List[str], use_websocket: Optional[bool] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Retrieves several jobs from device, waiting for them concurrently.
+
+        :param job_ids: unique ids of jobs
+        :param use_websocket: use websocket to minimize interaction
+
+        :return: (list) output from API for each job, in the order of ``job_ids``
+
+        """
+        return _run_coroutine(self.retrieve_jobs_async(job_ids, use_websocket))
+
+    async def retrieve_jobs_async(
+        self, job_ids: List[str], use_websocket: Optional[bool] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Retrieves several jobs from device, waiting for them concurrently.
+
+        :param job_ids: unique ids of jobs
+        :param use_websocket: use websocket to minimize interaction
+
+        :return: (list) output from API for each job, in the order of ``job_ids``
+
+        """
+        # log in once so that the retrievals share the same id-token
+        await self._in_thread(self.login)
+        return list(
+            await asyncio.gather(
+                *(self.retrieve_job_async(job_id, use_websocket) for job_id in job_ids)
+            )
+        )
+
+    def _deadline(self) -> float:
+        """Time by which to stop waiting for a job, following ``timeout``."""
+        return float("inf") if self.timeout is None else time.time() + self.timeout
+
+    def _poll_results(
+        self, job_id: str, deadline: Optional[float] = None
+    ) -> Optional[Dict]:
         jr = None
-        start_time = time.time()
-        while True:
-            if self.timeout is not None and time.time() > (start_time + self.timeout):
-                break
-            self.login()
+        # bind what is used on every iteration to locals
+        retrieve = self.retrieve_job_status
+        done = self.JOB_DONE
+        sleep = time.sleep
+        schedule = _PollSchedule(
+            self, self._deadline() if deadline is None else deadline
+        )
+        while time.time() <= schedule.deadline:
+            try:
+                wait_seconds = schedule.wait_seconds()
+                request_time = time.time()
+                # the id-token is refreshed if needed by retrieve_job_status
+                jr = retrieve(job_id, wait_seconds=wait_seconds)
+
+                # If we are failing to retrieve status of any kind, then fail out.
+                if jr is None:
+                    break
+                if jr.get("status") in done:
+                    return jr
+                delay = schedule.next_delay(jr.get("status"), request_time)
+                if delay is not None:
+                    sleep(delay)
+            except KeyboardInterrupt:
+                raise RuntimeError("Keyboard Interrupted")
+        return jr
+
+    def _stream_results(self, job_id: str, jr: Dict, deadline: float) -> Optional[Dict]:
+        """Wait for job completion on the server-sent events stream of the job.
+
+        :param job_id: unique id of job
+        :param jr: last known status of the job, returned on timeout
+        :param deadline: time by which to stop waiting
+
+        :return: (dict) output from API, or None if the stream is not offered
+            or ends before the job does
+        """
+        while time.time() < deadline:
+            headers = {**self._authorize(), "Accept": "text/event-stream"}
+            # reopen quiet streams rather than waiting on them past the deadline
+            read_timeout = min(self.SSE_READ_TIMEOUT, deadline - time.time())
             try:
-                jr = self.retrieve_job_status(job_id)
+                res = self.session.get(
+                    f"{self._job_url}/{job_id}/events",
+                    headers=headers,
+                    timeout=max(read_timeout, 1),
+                    stream=True,
+                )
+                with res:
+                    if res.status_code == HTTPStatus.NOT_FOUND:
+                        return None
+                    self._response_check(res, "job events")
+                    data: List[bytes] = []
+                    for line in res.iter_lines():
+                        if line.startswith(b"data:"):
+                            value = line[5:]
+                            data.append(value[1:] if value[:1] == b" " else value)
+                        elif not line and data:
+                            # a blank line ends the event
+                            jr = _json_loads(b"\n".join(data))
+                            data = []
+                            if not isinstance(jr, Dict):
+                                raise RuntimeError("Unable to decode response.")
+                            if jr.get("status") in self.JOB_DONE:
+                                return jr
+                        # comments (keepalives) and other fields are skipped
+                        if time.time() > deadline:
+                            return jr
+                # the stream ended before the job did
+                return None
+            except ReadTimeout:
+                continue
+            except RequestsConnectionError as e:
+                # a quiet stream times out while it is being read
+                if e.args and isinstance(e.args[0], ReadTimeoutError):
+                    continue
+                return None
+            except RequestException:
+                return None
+        return jr
+
+    async def _poll_results_async(
+        self, job_id: str, deadline: Optional[float] = None
+    ) -> Optional[Dict]:
+        """Asynchronous counterpart of :py:meth:`_poll_results`, sleeping on the
+        event loop between polls so that waiting jobs hold no thread."""
+        jr = None
+        done = self.JOB_DONE
+        schedule = _PollSchedule(
+            self, self._deadline() if deadline is None else deadline
+        )
+        while time.time() <= schedule.deadline:
+            try:
+                wait_seconds = schedule.wait_seconds()
+                request_time = time.time()
+                jr = await self._in_thread(
+                    self.retrieve_job_status, job_id, None, wait_seconds
+                )
 
                 # If we are failing to retrieve status of any kind, then fail out.
                 if jr is None:
                     break
-                if "status" in jr and jr["status"] in self.JOB_DONE:
+                if jr.get("status") in done:
                     return jr
-                time.sleep(self.retry_timeout)
+                delay = schedule.next_delay(jr.get("status"), request_time)
+                if delay is not None:
+                    await asyncio.sleep(delay)
             except KeyboardInterrupt:
                 raise RuntimeError("Keyboard Interrupted")
         return jr
 
-    async def _wait_results(self, job_id: str) -> Optional[Dict]:
-        start_time = time.time()
+    async def _in_thread(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the request threads of this instance."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._request_executor, func, *args
+        )
+
+    @staticmethod
+    async def _in_own_thread(func: Callable[..., T], *args: Any) -> T:
+        """Run a long-lived blocking call on a dedicated daemon thread."""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[T]" = loop.create_future()
+
+        def set_result(result: T) -> None:
+            if not future.done():
+                future.set_result(result)
+
+        def set_exception(exc: BaseException) -> None:
+            if not future.done():
+                future.set_exception(exc)
+
+        def run() -> None:
+            try:
+                result = func(*args)
+            except BaseException as exc:
+                loop.call_soon_threadsafe(set_exception, exc)
+            else:
+                loop.call_soon_threadsafe(set_result, result)
+
+        threading.Thread(target=run, daemon=True).start()
+        return await future
+
+    async def _wait_results(
+        self, job_id: str, deadline: Optional[float] = None
+    ) -> Optional[Dict]:
+        if deadline is None:
+            deadline = self._deadline()
+        timeout = None
+        if deadline != float("inf"):
+            timeout = max(0.0, deadline - time.time())
+        try:
+            return await asyncio.wait_for(
+                self._subscribe_results(job_id), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            return None
+
+    async def _subscribe_results(self, job_id: str) -> Optional[Dict]:
         while True:
-            if self.timeout is not None and time.time() > (start_time + self.timeout):
-                break
-            self.login()
-            jr = self.retrieve_job_status(job_id, True)
+            # a fresh task token is only needed when (re)opening the connection
+            jr = await self._in_thread(self.retrieve_job_status, job_id, True)
             if jr is None:
                 return jr
-            elif "status" in jr and jr["status"] in self.JOB_DONE:
+            elif jr.get("status") in self.JOB_DONE:
                 return jr
-            else:
-                task_token = jr["websocket"]["task_token"]
-                execution_arn = jr["websocket"]["executionArn"]
-                websocket_uri = self.url.replace("https://", "wss://ws.")
-                async with connect(websocket_uri) as websocket:
-                    body = {
-                        "action": "OpenConnection",
-                        "task_token": task_token,
-                        "executionArn": execution_arn,
-                    }
+            body = {
+                "action": "OpenConnection",
+                "task_token": jr["websocket"]["task_token"],
+                "executionArn": jr["websocket"]["executionArn"],
+            }
+            try:
+                async with connect(
+                    self._ws_uri,
+                    ping_interval=self.ws_ping_interval,
+                    ping_timeout=self.ws_ping_timeout,
+                    close_timeout=self.ws_close_timeout,
+                ) as websocket:
                     await websocket.send(json.dumps(body))
-                    while True:
-                        try:
-                            res = await asyncio.wait_for(
-                                websocket.recv(), timeout=self.ws_timeout
-                            )
-                            jr = json.loads(res)
-                            if not isinstance(jr, Dict):
-                                raise RuntimeError("Unable to decode response.")
-                            if "status" in jr and jr["status"] in self.JOB_DONE:
-                                return jr
-                        except (
-                            asyncio.TimeoutError,
-                            exceptions.ConnectionClosed,
-                        ):
-                            try:
-                                # Try to keep the connection alive...
-                                pong = await websocket.ping()
-                                await asyncio.wait_for(pong, timeout=10)
-                                continue
-                            except asyncio.TimeoutError:
-                                # If we are failing, wait a little while,
-                                #  then start from the top
-                                await asyncio.sleep(self.retry_timeout)
-                                break
-                        except KeyboardInterrupt:
-                            raise RuntimeError("Keyboard Interrupted")
+                    async for res in websocket:
+                        jr = _json_loads(res)
+                        if not isinstance(jr, Dict):
+                            raise RuntimeError("Unable to decode response.")
+                        if jr.get("status") in self.JOB_DONE:
+                            return jr
+            except exceptions.ConnectionClosed:
+                pass
+            except KeyboardInterrupt:
+                raise RuntimeError("Keyboard Interrupted")
+            # The connection was lost: wait a little while, then reconnect
+            await asyncio.sleep(self.retry_timeout)
 
     def status(self, machine: str) -> str:
         """
@@ -465,13 +955,10 @@ class QuantinuumAPI:
         :return: (str) status of machine
 
         """
-        id_token = self.login()
-        res = self.session.get(
-            f"{self.url}machine/{machine}",
-            headers={"Authorization": id_token},
-        )
+        headers = self._authorize()
+        res = self.session.get(f"{self.url}machine/{machine}", headers=headers)
         self._response_check(res, "get machine status")
-        jr = res.json()
+        jr = _json_loads(res.content)
 
         return str(jr["state"])
 
@@ -485,22 +972,53 @@ class QuantinuumAPI:
 
         """
 
-        id_token = self.login()
-        res = self.session.post(
-            f"{self.url}job/{job_id}/cancel", headers={"Authorization": id_token}
-        )
+        headers = self._authorize()
+        res = self.session.post(f"{self._job_url}/{job_id}/cancel", headers=headers)
         self._response_check(res, "job cancel")
-        jr = res.json()
+        jr = _json_loads(res.content)
 
         return jr  # type: ignore
 
 
+# Devices known to the offline API by default, shared by all its instances
+_DEFAULT_MACHINES: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType(
+        {
+            "name": "H1-1",
+            "n_qubits": 20,
+            "gateset": ("RZZ", "Riswap", "Rxxyyzz"),
+            "n_classical_registers": 120,
+            "n_shots": 10000,
+            "system_type": "hardware",
+            "emulator": "H1-1E",
+            "syntax_checker": "H1-1SC",
+            "batching": True,
+            "wasm": True,
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "H2-1",
+            "n_qubits": 32,
+            "gateset": ("RZZ", "Riswap", "Rxxyyzz"),
+            "n_classical_registers": 120,
+            "n_shots": 10000,
+            "system_type": "hardware",
+            "emulator": "H2-1E",
+            "syntax_checker": "H2-1SC",
+            "batching": True,
+            "wasm": True,
+        }
+    ),
+)
+
+
 class QuantinuumAPIOffline:
     """
     Offline copy of the interface to the Quantinuum remote API.
     """
 
-    def __init__(self, machine_list: Optional[list] = None):
+    def __init__(self, machine_list: Optional[Sequence[Mapping[str, Any]]] = None):
         """Initialize offline API client.
 
         Tries to allow all the operations of the QuantinuumAPI without
@@ -520,33 +1038,8 @@ class QuantinuumAPIOffline:
             "batching": True,
             }
         """
-        if machine_list == None:
-            machine_list = [
-                {
-                    "name": "H1-1",
-                    "n_qubits": 20,
-                    "gateset": ["RZZ", "Riswap", "Rxxyyzz"],
-                    "n_classical_registers": 120,
-                    "n_shots": 10000,
-                    "system_type": "hardware",
-                    "emulator": "H1-1E",
-                    "syntax_checker": "H1-1SC",
-                    "batching": True,
-                    "wasm": True,
-                },
-                {
-                    "name": "H2-1",
-                    "n_qubits": 32,
-                    "gateset": ["RZZ", "Riswap", "Rxxyyzz"],
-                    "n_classical_registers": 120,
-                    "n_shots": 10000,
-                    "system_type": "hardware",
-                    "emulator": "H2-1E",
-                    "syntax_checker": "H2-1SC",
-                    "batching": True,
-                    "wasm": True,
-                },
-            ]
+        if machine_list is None:
+            machine_list = _DEFAULT_MACHINES
         self.provider = ""
         self.url = ""
         self.online = False
@@ -554,7 +1047,7 @@ class QuantinuumAPIOffline:
         self._cred_store = None
         self.submitted: list = []
 
-    def _get_machine_list(self) -> Optional[list]:
+    def _get_machine_list(self) -> Sequence[Mapping[str, Any]]:
         """returns the given list of the avilable machines
         :return: list of machines
         """
@@ -581,6 +1074,17 @@ class QuantinuumAPIOffline:
         self.submitted.append(body)
         return None
 
+    def _submit_jobs(self, bodies: List[Dict], ordered: bool = False) -> List[None]:
+        """The function will take the submitted jobs and store them for later
+
+        :param bodies: submitted jobs
+        :param ordered: unused offline, jobs are always stored in order
+
+        :return: None for each job
+        """
+        self.submitted.extend(bodies)
+        return [None] * len(bodies)
+
     def get_jobs(self) -> Optional[list]:
         """The function will return all the jobs that have been submitted
 
@@ -588,10 +1092,12 @@ class QuantinuumAPIOffline:
         """
         return self.submitted
 
-    def _response_check(self, res: Response, description: str) -> None:
+    def _response_check(
+        self, res: Response, description: str, parsed: Optional[Dict] = None
+    ) -> None:
         """No _response_check offline"""
 
-        jr = res.json()
+        jr = res.json() if parsed is None else parsed
         raise QuantinuumAPIError(
             (
                 f"Reponse can't be checked offline: {description}."
@@ -619,6 +1125,29 @@ class QuantinuumAPIOffline:
             )
         )
 
+    async def retrieve_job_async(
+        self, job_id: str, use_websocket: Optional[bool] = None
+    ) -> None:
+        """No retrieve_job_async offline"""
+        self.retrieve_job(job_id, use_websocket)
+
+    def retrieve_jobs(
+        self, job_ids: List[str], use_websocket: Optional[bool] = None
+    ) -> None:
+        """No retrieve_jobs offline"""
+        raise QuantinuumAPIError(
+            (
+                f"Can't retrieve jobs offline: job_ids {job_ids}."
+                f"\n use_websocket {use_websocket}"
+            )
+        )
+
+    async def retrieve_jobs_async(
+        self, job_ids: List[str], use_websocket: Optional[bool] = None
+    ) -> None:
+        """No retrieve_jobs_async offline"""
+        self.retrieve_jobs(job_ids, use_websocket)
+
     def status(self, machine: str) -> str:
         """No retrieve_job_status offline"""
 
@@ -16,7 +16,6 @@
 from ast import literal_eval
 from base64 import b64encode
 from collections import Counter
-from copy import copy
 from dataclasses import dataclass
 from enum import Enum
 from functools import cache
@@ -180,6 +179,19 @@ class BatchingUnsupported(Exception):
     """Batching not supported for this backend."""
 
 
+class JobSubmissionError(QuantinuumAPIError):
+    """Some, but not all, of the jobs of a call to
+    :py:meth:`QuantinuumBackend.process_circuits` were submitted.
+
+    ``handles`` holds the handle of each job, in the order of the circuits,
+    with None for the jobs that were not accepted.
+    """
+
+    def __init__(self, message: str, handles: List[Optional[ResultHandle]]):
+        super().__init__(message)
+        self.handles = handles
+
+
 @dataclass
 class DeviceNotAvailable(Exception):
     device_name: str
@@ -353,7 +365,7 @@ class QuantinuumBackend(Backend):
     def _dict_to_backendinfo(
         cls, dct: Dict[str, Any], local_emulator: bool = False
     ) -> BackendInfo:
-        dct1 = copy(dct)
+        dct1 = dict(dct)
         name: str = dct1.pop("name")
         n_qubits: int = dct1.pop("n_qubits")
         n_cl_reg: Optional[int] = None
@@ -393,7 +405,7 @@ class QuantinuumBackend(Backend):
         jr = cls._available_devices(api_handler)
         devices = []
         for d in jr:
-            devices.append(cls._dict_to_backendinfo(copy(d)))
+            devices.append(cls._dict_to_backendinfo(d))
             if have_pecos() and (d["system_type"] == "hardware"):
                 # Add a local-emulator variant
                 devices.append(cls._dict_to_backendinfo(d, local_emulator=True))
@@ -678,6 +690,48 @@ class QuantinuumBackend(Backend):
                 "submit_program() not supported with local emulator"
             )
 
+        body = self._program_body(
+            language,
+            program,
+            n_shots,
+            name=name,
+            noisy_simulation=noisy_simulation,
+            group=group,
+            wasm_file_handler=wasm_file_handler,
+            pytket_pass=pytket_pass,
+            no_opt=no_opt,
+            allow_2q_gate_rebase=allow_2q_gate_rebase,
+            options=options,
+            request_options=request_options,
+        )
+
+        try:
+            res = self.api_handler._submit_job(body)
+        except ConnectionError:
+            raise ConnectionError(
+                f"{self._label} Connection Error: Error during submit..."
+            )
+        return self._submission_handle(res, results_selection)
+
+    def _program_body(
+        self,
+        language: Language,
+        program: str,
+        n_shots: int,
+        name: Optional[str] = None,
+        noisy_simulation: bool = True,
+        group: Optional[str] = None,
+        wasm_file_handler: Optional[WasmFileHandler] = None,
+        pytket_pass: Optional[BasePass] = None,
+        no_opt: bool = False,
+        allow_2q_gate_rebase: bool = False,
+        options: Optional[Dict[str, Any]] = None,
+        request_options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Build the request body submitting a program to the backend.
+
+        See :py:meth:`submit_program` for the parameters.
+        """
         body: Dict[str, Any] = {
             "name": name or f"{self._label}",
             "count": n_shots,
@@ -712,25 +766,27 @@ class QuantinuumBackend(Backend):
 
         # apply any overrides or extra options
         body.update(request_options or {})
+        return body
 
-        try:
-            res = self.api_handler._submit_job(body)
-            if self.api_handler.online:
-                jobdict = res.json()
-                if res.status_code != HTTPStatus.OK:
-                    raise QuantinuumAPIError(
-                        f'HTTP error submitting job, {jobdict["error"]}'
-                    )
-            else:
-                return ResultHandle(
-                    "",
-                    "null",
-                    -1 if results_selection is None else len(results_selection),
-                    "" if results_selection is None else json.dumps(results_selection),
+    def _submission_handle(
+        self,
+        res: Optional[requests.Response],
+        results_selection: Optional[List[Tuple[str, int]]] = None,
+    ) -> ResultHandle:
+        """Check the response to a job submission and build its handle."""
+        if self.api_handler.online:
+            assert res is not None
+            jobdict = res.json()
+            if res.status_code != HTTPStatus.OK:
+                raise QuantinuumAPIError(
+                    f'HTTP error submitting job, {jobdict["error"]}'
                 )
-        except ConnectionError:
-            raise ConnectionError(
-                f"{self._label} Connection Error: Error during submit..."
+        else:
+            return ResultHandle(
+                "",
+                "null",
+                -1 if results_selection is None else len(results_selection),
+                "" if results_selection is None else json.dumps(results_selection),
             )
 
         # extract job ID from response
@@ -818,6 +874,9 @@ class QuantinuumBackend(Backend):
         language = cast(Language, kwargs.get("language", Language.QASM))
 
         handle_list = []
+        # request bodies, postprocessing circuits and results selections of the
+        # jobs to submit together once all circuits are converted
+        submissions: List[Tuple[Dict[str, Any], Any, List[Tuple[str, int]]]] = []
 
         max_shots = self.backend_info.misc.get("n_shots") if self.backend_info else None
         seed = kwargs.get("seed")
@@ -911,7 +970,7 @@ class QuantinuumBackend(Backend):
                         )
                     )
                 else:
-                    handle = self.submit_program(
+                    body = self._program_body(
                         language,
                         quantinuum_circ,
                         n_shots,
@@ -927,15 +986,50 @@ class QuantinuumBackend(Backend):
                             Dict[str, Any], kwargs.get("request_options", {})
                         ),
                     )
-
-                    handle = ResultHandle(
-                        self.get_jobid(handle),
-                        json.dumps(ppcirc_rep),
-                        len(results_selection),
-                        json.dumps(results_selection),
-                    )
-                    handle_list.append(handle)
-                    self._cache[handle] = dict()
+                    submissions.append((body, ppcirc_rep, results_selection))
+
+        if submissions:
+            request_options = cast(Dict[str, Any], kwargs.get("request_options", {}))
+            results = self.api_handler._submit_jobs(
+                [body for body, _, _ in submissions],
+                # jobs of a batch run in the order the server receives them
+                ordered="batch-exec" in request_options,
+            )
+            handles: List[Optional[ResultHandle]] = [None] * len(submissions)
+            failures: List[Exception] = []
+            for i, res in enumerate(results):
+                if isinstance(res, Exception):
+                    failures.append(res)
+                    continue
+                try:
+                    jobid = self.get_jobid(self._submission_handle(res))
+                except QuantinuumAPIError as e:
+                    failures.append(e)
+                    continue
+                _, ppcirc_rep, results_selection = submissions[i]
+                handle = ResultHandle(
+                    jobid,
+                    json.dumps(ppcirc_rep),
+                    len(results_selection),
+                    json.dumps(results_selection),
+                )
+                handles[i] = handle
+                self._cache[handle] = dict()
+            if failures:
+                n_accepted = len(submissions) - handles.count(None)
+                if n_accepted == 0:
+                    if isinstance(failures[0], ConnectionError):
+                        raise ConnectionError(
+                            f"{self._label} Connection Error: Error during submit..."
+                        ) from failures[0]
+                    raise failures[0]
+                # the accepted jobs run regardless, so hand them back
+                raise JobSubmissionError(
+                    f"Only {n_accepted} of {len(submissions)} jobs were submitted: "
+                    f"{failures[0]}",
+                    handles,
+                ) from failures[0]
+            handle_list.extend(cast(List[ResultHandle], handles))
 
         return handle_list
 
@@ -47,11 +47,13 @@ setup(
         "requests >= 2.2",
         "types-requests",
         "websockets >= 7.0",
-        "nest_asyncio >= 1.2",
         "pyjwt ~= 2.4",
         "msal ~= 1.18",
     ],
-    extras_require={"pecos": ["pytket-pecos >= 0.1.4"]},
+    extras_require={
+        "pecos": ["pytket-pecos >= 0.1.4"],
+        "orjson": ["orjson >= 3.0"],
+    },
     classifiers=[
         "Environment :: Console",
         "Programming Language :: Python :: 3.9",
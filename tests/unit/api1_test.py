@@ -29,6 +29,7 @@ from pytket.backends import ResultHandle, StatusEnum
 from pytket.extensions.quantinuum.backends.api_wrappers import QuantinuumAPI
 from pytket.extensions.quantinuum.backends import (
     QuantinuumBackend,
+    JobSubmissionError,
     Language,
     have_pecos,
 )
@@ -255,10 +256,10 @@ def test_mfa_login_flow(
     fake_device = mock_machine_info["name"]
 
     def match_mfa_request(request: requests.PreparedRequest) -> bool:
-        return "code" in request.body  # type: ignore
+        return b"code" in request.body  # type: ignore
 
     def match_normal_request(request: requests.PreparedRequest) -> bool:
-        return "code" not in request.body  # type: ignore
+        return b"code" not in request.body  # type: ignore
 
     mfa_login_route = requests_mock.register_uri(
         "POST",
@@ -468,6 +469,59 @@ def test_resumed_batching(
     assert "batch-end" in submitted_json
 
 
+@pytest.mark.parametrize("batch", [False, True])
+def test_partial_submission(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+    sample_machine_infos: Dict[str, Any],
+    batch: bool,
+) -> None:
+    """Test that the handles of the accepted jobs are kept when another job
+    fails to submit, and that jobs of a batch stop at the first failure."""
+
+    def submit(request: Any, context: Any) -> Dict[str, Any]:
+        name = request.json()["name"]
+        if name == "bad":
+            context.status_code = 400
+            return {"error": {"code": 21, "text": "Invalid program"}}
+        return {"job": f"job-{name}"}
+
+    job_submit_route = requests_mock.register_uri(
+        "POST",
+        "https://qapi.quantinuum.com/v1/job",
+        json=submit,
+        headers={"Content-Type": "application/json"},
+    )
+    requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/machine/?config=true",
+        json=sample_machine_infos,
+        headers={"Content-Type": "application/json"},
+    )
+
+    backend = QuantinuumBackend(
+        device_name="H1-1E",
+    )
+    backend.api_handler = mock_quum_api_handler
+
+    circs = [
+        backend.get_compiled_circuit(Circuit(2, name=name).H(0).measure_all())
+        for name in ("a", "bad", "c")
+    ]
+    kwargs: Dict[str, Any] = {"request_options": {"batch-exec": 500}} if batch else {}
+
+    with pytest.raises(JobSubmissionError) as e:
+        backend.process_circuits(circs, n_shots=10, valid_check=False, **kwargs)
+
+    jobids = [None if h is None else backend.get_jobid(h) for h in e.value.handles]
+    if batch:
+        assert jobids == ["job-a", None, None]
+        assert job_submit_route.call_count == 2
+    else:
+        assert jobids == ["job-a", None, "job-c"]
+        assert job_submit_route.call_count == 3
+
+
 def test_available_devices(
     requests_mock: Mocker,
     mock_quum_api_handler: QuantinuumAPI,
@@ -12,12 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from io import StringIO
-from typing import Any, Tuple
+from typing import Any, Dict, List, Tuple
 
+import pytest
+import requests
+from requests.models import Response
 from requests_mock.mocker import Mocker
+from urllib3.exceptions import ReadTimeoutError
 
-from pytket.extensions.quantinuum.backends.api_wrappers import QuantinuumAPI
+from pytket.extensions.quantinuum.backends.api_wrappers import (
+    QuantinuumAPI,
+    _run_coroutine,
+)
 from pytket.extensions.quantinuum.backends.credential_storage import (
     MemoryCredentialStorage,
 )
@@ -119,3 +131,536 @@ def test_full_login(
             api_handler._cred_store._refresh_token_timeout,
         )
     )
+
+
+def test_poll_results_backoff(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+    monkeypatch: Any,
+) -> None:
+    """Test that polling backs off exponentially between status requests
+    and resets the delay when the job changes state."""
+
+    job_id = "abc-123"
+    requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}",
+        [
+            {"json": {"job": job_id, "status": "queued"}},
+            {"json": {"job": job_id, "status": "queued"}},
+            {"json": {"job": job_id, "status": "queued"}},
+            {"json": {"job": job_id, "status": "running"}},
+            {"json": {"job": job_id, "status": "running"}},
+            {"json": {"job": job_id, "status": "completed"}},
+        ],
+    )
+
+    delays: List[float] = []
+    monkeypatch.setattr("time.sleep", delays.append)
+    monkeypatch.setattr("random.uniform", lambda a, b: 0)
+
+    mock_quum_api_handler.use_websocket = False
+    with mock_quum_api_handler.override_timeouts(
+        retry_timeout_min=1, retry_timeout_max=3
+    ):
+        jr = mock_quum_api_handler._poll_results(job_id)
+
+    assert jr is not None
+    assert jr["status"] == "completed"
+    assert delays == [1, 2, 3, 1, 2]
+    assert mock_quum_api_handler.retry_timeout_min == 1
+    assert mock_quum_api_handler.retry_timeout_max == 30
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_poll_results_backoff_stops_at_deadline(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+    monkeypatch: Any,
+) -> None:
+    """Test that polling never sleeps past the deadline."""
+
+    job_id = "abc-123"
+    requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}",
+        [
+            {"json": {"job": job_id, "status": "queued"}},
+            {"json": {"job": job_id, "status": "queued"}},
+            {"json": {"job": job_id, "status": "completed"}},
+        ],
+    )
+
+    delays: List[float] = []
+    monkeypatch.setattr("time.sleep", delays.append)
+
+    mock_quum_api_handler.use_websocket = False
+    with mock_quum_api_handler.override_timeouts(
+        retry_timeout_min=10, retry_timeout_max=20
+    ):
+        jr = mock_quum_api_handler._poll_results(job_id, time.time() + 2)
+
+    assert jr is not None
+    assert jr["status"] == "completed"
+    assert len(delays) == 2
+    assert all(0 <= delay <= 2 for delay in delays)
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_poll_results_long_polling_fallback(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+    monkeypatch: Any,
+) -> None:
+    """Test that long polling falls back to regular polling when the server
+    keeps answering without waiting for a change of state."""
+
+    job_id = "abc-123"
+    status_route = requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}",
+        [{"json": {"job": job_id, "status": "queued"}}] * 4
+        + [{"json": {"job": job_id, "status": "completed"}}],
+    )
+
+    delays: List[float] = []
+    monkeypatch.setattr("time.sleep", delays.append)
+
+    mock_quum_api_handler.use_websocket = False
+    mock_quum_api_handler.use_long_polling = True
+    jr = mock_quum_api_handler._poll_results(job_id)
+
+    assert jr is not None
+    assert jr["status"] == "completed"
+    assert len(delays) == 3
+    queries = [req.qs for req in status_route.request_history]
+    assert queries[:4] == [{"wait": ["30"]}] * 4
+    assert queries[4] == {}
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_poll_results_long_polling_short_wait(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+    monkeypatch: Any,
+) -> None:
+    """Test that long polling asks the server to wait at least a second."""
+
+    job_id = "abc-123"
+    status_route = requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}",
+        [
+            {"json": {"job": job_id, "status": "queued"}},
+            {"json": {"job": job_id, "status": "completed"}},
+        ],
+    )
+    monkeypatch.setattr("time.sleep", lambda _: None)
+
+    mock_quum_api_handler.use_websocket = False
+    mock_quum_api_handler.use_long_polling = True
+    mock_quum_api_handler.retry_timeout_max = 0.5
+    jr = mock_quum_api_handler._poll_results(job_id)
+
+    assert jr is not None
+    assert jr["status"] == "completed"
+    queries = [req.qs for req in status_route.request_history]
+    assert queries == [{"wait": ["1"]}] * 2
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_retrieve_job_sse(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+) -> None:
+    """Test that job completion can be awaited on the server-sent events
+    stream of the job."""
+
+    job_id = "abc-123"
+    status_route = requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}",
+        json={"job": job_id, "status": "queued"},
+    )
+    events = (
+        ": keepalive\n\n"
+        f'data: {{"job": "{job_id}", "status": "running"}}\n\n'
+        "event: status\n"
+        f'data: {{"job": "{job_id}",\n'
+        'data: "status": "completed"}\n\n'
+    )
+    # the first streams stay quiet for too long, while connecting or while
+    # being read, and are reopened
+    read_timeout = ReadTimeoutError(None, "", "Read timed out.")  # type: ignore
+    events_route = requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}/events",
+        [
+            {"exc": requests.exceptions.ReadTimeout},
+            {"exc": requests.exceptions.ConnectionError(read_timeout)},
+            {"text": events, "headers": {"Content-Type": "text/event-stream"}},
+        ],
+    )
+
+    mock_quum_api_handler.use_websocket = False
+    mock_quum_api_handler.use_sse = True
+    jr = mock_quum_api_handler.retrieve_job(job_id)
+
+    assert jr is not None
+    assert jr["status"] == "completed"
+    assert status_route.call_count == 1
+    assert events_route.call_count == 3
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_retrieve_job_sse_timeout(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+) -> None:
+    """Test that a quiet server-sent events stream gives up at the deadline
+    rather than falling back to another way of waiting."""
+
+    job_id = "abc-123"
+    status_route = requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}",
+        json={"job": job_id, "status": "queued"},
+    )
+    requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}/events",
+        exc=requests.exceptions.ReadTimeout,
+    )
+
+    mock_quum_api_handler.use_websocket = False
+    mock_quum_api_handler.use_sse = True
+    with mock_quum_api_handler.override_timeouts(timeout=1):
+        jr = mock_quum_api_handler.retrieve_job(job_id)
+
+    assert jr is not None
+    assert jr["status"] == "queued"
+    assert status_route.call_count == 1
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_retrieve_job_sse_fallback(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+    monkeypatch: Any,
+) -> None:
+    """Test that retrieval falls back to polling when the server does not
+    offer a server-sent events stream."""
+
+    job_id = "abc-123"
+    requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}",
+        [
+            {"json": {"job": job_id, "status": "queued"}},
+            {"json": {"job": job_id, "status": "completed"}},
+        ],
+    )
+    events_route = requests_mock.register_uri(
+        "GET",
+        f"https://qapi.quantinuum.com/v1/job/{job_id}/events",
+        status_code=404,
+        json={"error": {"code": 404, "text": "Not Found"}},
+    )
+    monkeypatch.setattr("time.sleep", lambda _: None)
+
+    mock_quum_api_handler.use_websocket = False
+    mock_quum_api_handler.use_sse = True
+    jr = mock_quum_api_handler.retrieve_job(job_id)
+
+    assert jr is not None
+    assert jr["status"] == "completed"
+    assert events_route.call_count == 1
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_login_caches_id_token(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+    mock_token: str,
+) -> None:
+    """Test that login() reuses the cached id-token without consulting the
+    token store, until the authentication is deleted."""
+
+    n_requests = requests_mock.call_count
+    cached = mock_quum_api_handler._id_token_cache
+    assert cached is not None
+    assert cached[1] == {"Authorization": mock_token}
+
+    # the token store would now need a refresh, but the cached token is valid
+    assert isinstance(mock_quum_api_handler._cred_store, MemoryCredentialStorage)
+    mock_quum_api_handler._cred_store._id_token = None
+    assert mock_quum_api_handler.login() == mock_token
+    assert requests_mock.call_count == n_requests
+
+    mock_quum_api_handler.delete_authentication()
+    assert mock_quum_api_handler._id_token_cache is None
+
+
+def test_submit_jobs(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+) -> None:
+    """Test that concurrently submitted jobs get their responses back in
+    submission order."""
+
+    def job_id(request: Any, context: Any) -> Dict[str, str]:
+        return {"job": "job-" + request.json()["name"]}
+
+    job_submit_route = requests_mock.register_uri(
+        "POST",
+        "https://qapi.quantinuum.com/v1/job",
+        json=job_id,
+        headers={"Content-Type": "application/json"},
+    )
+
+    names = [str(i) for i in range(20)]
+    responses = mock_quum_api_handler._submit_jobs([{"name": n} for n in names])
+
+    assert job_submit_route.call_count == len(names)
+    assert [res.json()["job"] for res in responses if isinstance(res, Response)] == [
+        "job-" + n for n in names
+    ]
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_retrieve_jobs(
+    requests_mock: Mocker,
+    mock_quum_api_handler: QuantinuumAPI,
+) -> None:
+    """Test that several jobs can be retrieved at once."""
+
+    job_ids = ["abc-123", "abc-456", "abc-789"]
+    for job_id in job_ids:
+        requests_mock.register_uri(
+            "GET",
+            f"https://qapi.quantinuum.com/v1/job/{job_id}",
+            json={"job": job_id, "status": "completed"},
+            headers={"Content-Type": "application/json"},
+        )
+
+    jobs = mock_quum_api_handler.retrieve_jobs(job_ids, use_websocket=False)
+
+    assert [jr["job"] for jr in jobs if jr is not None] == job_ids
+
+    mock_quum_api_handler.delete_authentication()
+
+
+def test_retrieve_jobs_polls_concurrently(
+    mock_quum_api_handler: QuantinuumAPI,
+    monkeypatch: Any,
+) -> None:
+    """Test that jobs waited on concurrently by polling don't each hold a
+    thread while waiting between polls."""
+
+    n_jobs = 40
+    calls: Dict[str, int] = {}
+    waiting: List[int] = []
+    lock = threading.Lock()
+
+    def retrieve_job_status(
+        job_id: str, use_websocket: Any = None, wait_seconds: Any = None
+    ) -> Dict[str, str]:
+        with lock:
+            calls[job_id] = calls.get(job_id, 0) + 1
+            # jobs between their first and second poll
+            waiting.append(sum(1 for n in calls.values() if n == 2))
+            done = calls[job_id] >= 3
+        return {"job": job_id, "status": "completed" if done else "queued"}
+
+    monkeypatch.setattr(
+        mock_quum_api_handler, "retrieve_job_status", retrieve_job_status
+    )
+    mock_quum_api_handler.use_websocket = False
+    mock_quum_api_handler.retry_timeout_min = 0.2
+
+    job_ids = [f"job-{i}" for i in range(n_jobs)]
+    jobs = mock_quum_api_handler.retrieve_jobs(job_ids)
+
+    assert [jr["job"] for jr in jobs if jr is not None] == job_ids
+    # every job was waiting between polls at the same time
+    assert max(waiting) == n_jobs
+
+
+def test_retrieve_jobs_sse_streams_hold_no_request_thread(
+    mock_quum_api_handler: QuantinuumAPI,
+    monkeypatch: Any,
+) -> None:
+    """Test that jobs waited on concurrently over server-sent events can all
+    stream at once, even with fewer request threads than jobs."""
+
+    job_ids = ["abc-123", "abc-456", "abc-789"]
+    # every stream waits for all the others to be open at the same time
+    streaming = threading.Barrier(len(job_ids), timeout=5)
+
+    def retrieve_job_status(
+        job_id: str, use_websocket: Any = None, wait_seconds: Any = None
+    ) -> Dict[str, str]:
+        return {"job": job_id, "status": "queued"}
+
+    def stream_results(job_id: str, jr: Dict, deadline: float) -> Dict[str, str]:
+        streaming.wait()
+        return {"job": job_id, "status": "completed"}
+
+    monkeypatch.setattr(
+        mock_quum_api_handler, "retrieve_job_status", retrieve_job_status
+    )
+    monkeypatch.setattr(mock_quum_api_handler, "_stream_results", stream_results)
+    monkeypatch.setattr(
+        mock_quum_api_handler, "_request_executor", ThreadPoolExecutor(max_workers=1)
+    )
+    mock_quum_api_handler.use_sse = True
+
+    jobs = mock_quum_api_handler.retrieve_jobs(job_ids)
+
+    assert [jr["job"] for jr in jobs if jr is not None] == job_ids
+
+
+def test_default_session_does_not_retry_read_timeouts() -> None:
+    """Test that the default session gives up on a request as soon as reading
+    its response times out, so that request timeouts bound the wait."""
+
+    requests_received: List[str] = []
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            requests_received.append(self.path)
+            time.sleep(1)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        api_handler = QuantinuumAPI()
+        # route the local plain HTTP server through the adapter of the session
+        api_handler.session.mount(
+            "http://", api_handler.session.get_adapter("https://")
+        )
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            api_handler.session.get(
+                f"http://127.0.0.1:{server.server_port}/job", timeout=0.2
+            )
+        assert requests_received == ["/job"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_run_coroutine_in_running_loop() -> None:
+    """Test that synchronous retrieval also works while an event loop is
+    running, as in Jupyter notebooks."""
+
+    async def nested() -> int:
+        return _run_coroutine(asyncio.sleep(0, result=1))
+
+    assert _run_coroutine(asyncio.sleep(0, result=0)) == 0
+    assert asyncio.run(nested()) == 1
+
+
+def test_concurrent_login(
+    requests_mock: Mocker,
+    mock_credentials: Tuple[str, str],
+    mock_token: str,
+) -> None:
+    """Test that threads logging in at the same time share a single login."""
+    username, pwd = mock_credentials
+
+    login_route = requests_mock.register_uri(
+        "POST",
+        "https://qapi.quantinuum.com/v1/login",
+        json={
+            "id-token": mock_token,
+            "refresh-token": mock_token,
+        },
+        headers={"Content-Type": "application/json"},
+    )
+
+    api_handler = QuantinuumAPI(  # type: ignore # pylint: disable=unexpected-keyword-arg
+        _QuantinuumAPI__user_name=username,
+        _QuantinuumAPI__pwd=pwd,
+    )
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tokens = list(executor.map(lambda _: api_handler.login(), range(8)))
+
+    assert tokens == [mock_token] * 8
+    assert login_route.call_count == 1
+
+    api_handler.delete_authentication()
+
+
+def test_max_concurrent_requests(
+    requests_mock: Mocker,
+    mock_credentials: Tuple[str, str],
+    mock_token: str,
+) -> None:
+    """Test that job status requests beyond the limit queue on the client."""
+    username, pwd = mock_credentials
+
+    requests_mock.register_uri(
+        "POST",
+        "https://qapi.quantinuum.com/v1/login",
+        json={
+            "id-token": mock_token,
+            "refresh-token": mock_token,
+        },
+        headers={"Content-Type": "application/json"},
+    )
+    requests_mock.register_uri(
+        "GET",
+        "https://qapi.quantinuum.com/v1/job/abc-123",
+        json={"job": "abc-123", "status": "completed"},
+        headers={"Content-Type": "application/json"},
+    )
+
+    api_handler = QuantinuumAPI(  # type: ignore # pylint: disable=unexpected-keyword-arg
+        max_concurrent_requests=2,
+        _QuantinuumAPI__user_name=username,
+        _QuantinuumAPI__pwd=pwd,
+    )
+
+    # requests_mock serialises the requests it answers, so track the ones in
+    # flight around the session instead
+    get = api_handler.session.get
+    in_flight: List[None] = []
+    peak: List[int] = []
+    lock = threading.Lock()
+
+    def tracked_get(*args: Any, **kwargs: Any) -> Any:
+        with lock:
+            in_flight.append(None)
+            peak.append(len(in_flight))
+        time.sleep(0.05)
+        try:
+            return get(*args, **kwargs)
+        finally:
+            with lock:
+                in_flight.pop()
+
+    api_handler.session.get = tracked_get  # type: ignore
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        jobs = list(
+            executor.map(lambda _: api_handler.retrieve_job_status("abc-123"), range(8))
+        )
+
+    assert all(jr is not None and jr["status"] == "completed" for jr in jobs)
+    assert max(peak) == 2
+
+    api_handler.delete_authentication()